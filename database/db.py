@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 Base = declarative_base()
@@ -8,4 +8,31 @@ Session = sessionmaker()
 def configure_database(conn_url: str = "sqlite:///octave.db"):
     engine = create_engine(conn_url, future=True)
     Base.metadata.create_all(engine)
+    add_missing_columns(engine)
     Session.configure(bind=engine, future=True)
+
+
+def add_missing_columns(engine):
+    # create_all does not alter existing tables, so nullable columns added to a model
+    # after its table was created are added here. A missing NOT NULL column cannot be
+    # added to existing rows, so it fails startup instead of every later query.
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(
+                        f"Column {column.name} is missing from table {table.name} and "
+                        "is NOT NULL, so it cannot be added automatically"
+                    )
+                column_type = column.type.compile(engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {quote(table.name)} "
+                        f"ADD COLUMN {quote(column.name)} {column_type}"
+                    )
+                )
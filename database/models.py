@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.db import Base
@@ -16,20 +18,52 @@ class Battery(Base):
     cycles: Mapped[float] = mapped_column(
         nullable=False, default=0.0
     )  # 0 cycles when created
+    chemistry: Mapped[Optional[str]] = mapped_column(
+        nullable=True, default=None
+    )  # No chemistry means an ideal battery without losses or degradation
+    round_trip_efficiency: Mapped[Optional[float]] = mapped_column(
+        nullable=True, default=None
+    )  # Overrides the chemistry default when set
+    end_of_life_cycles: Mapped[Optional[float]] = mapped_column(
+        nullable=True, default=None
+    )  # Stretches or shrinks the chemistry fade curve when set
 
-    def to_dict(self):
+    def to_dict(self, numeric=False):
         return {
             "battery_id": self.battery_id,
             "capacity_kwh": self.capacity_kwh,
             "maximum_power_kw": self.maximum_power_kw,
-            "state_of_charge": str(self.state_of_charge) + "%",
+            "state_of_charge": (
+                self.state_of_charge if numeric else str(self.state_of_charge) + "%"
+            ),
             "cycles": round(self.cycles, 2),
+            "chemistry": self.chemistry,
+            "round_trip_efficiency": self.round_trip_efficiency,
+            "end_of_life_cycles": self.end_of_life_cycles,
         }
 
 
 class CreateBattery(BaseModel):
     capacity_kwh: float = Field(..., gt=0, description="Capacity should be greater than 0")
     maximum_power_kw: float = Field(..., gt=0, description="Maximum power should be greater than 0")
+    chemistry: Optional[Literal["lfp", "nmc"]] = Field(
+        None, description="Enables the degradation and efficiency model"
+    )
+    round_trip_efficiency: Optional[float] = Field(
+        None, gt=0, le=1, description="Round trip efficiency between 0 and 1"
+    )
+    end_of_life_cycles: Optional[float] = Field(
+        None, gt=0, description="Cycles at which capacity fade ends"
+    )
+
+    @model_validator(mode="after")
+    def check_chemistry(self):
+        if self.chemistry is None:
+            if self.round_trip_efficiency is not None:
+                raise ValueError("round_trip_efficiency requires a chemistry")
+            if self.end_of_life_cycles is not None:
+                raise ValueError("end_of_life_cycles requires a chemistry")
+        return self
 
 class UpdateBattery(BaseModel):
     battery_id: str = Field(..., description="Unique Battery ID")
@@ -5,7 +5,9 @@ from pydantic import ValidationError
 
 from database.db import Session
 from database.models import Battery, CreateBattery, UpdateBattery
+from src.battery_model import BatteryModel
 from src.octave_batteries import OctaveBattery
+from utils.encoding import encode, negotiate, wants_numeric
 from utils.utils import logger
 
 app = Flask(__name__)
@@ -27,20 +29,22 @@ def get_all_batteries():
         query = query.limit(limit).offset(offset)  # setting limit and offset
 
         rows = query.all()
-        batteries = [b.to_dict() for b in rows]
+        mimetype = negotiate()
+        numeric = wants_numeric(mimetype)
+        batteries = [b.to_dict(numeric=numeric) for b in rows]
 
         next_offset = offset + limit  # setting next offset
         next_link = None
         if next_offset < total:
             next_link = f"?limit={limit}&offset={next_offset}"
 
-        return jsonify({
+        return encode({
             "total": total,
             "limit": limit,
             "offset": offset,
             "next": next_link,
             "batteries": batteries
-        }), 200
+        }, mimetype), 200
 
     except Exception as e:
         logger.error(f"Internal Server Error: {e}, status code: 500")
@@ -83,6 +87,9 @@ def create_battery():
             battery_id=str(uuid4()),
             capacity_kwh=validated.capacity_kwh,
             maximum_power_kw=validated.maximum_power_kw,
+            chemistry=validated.chemistry,
+            round_trip_efficiency=validated.round_trip_efficiency,
+            end_of_life_cycles=validated.end_of_life_cycles,
         )
 
         session.add(battery)
@@ -91,6 +98,9 @@ def create_battery():
         return jsonify({
             "capacity_kwh": battery.capacity_kwh,
             "maximum_power_kw": battery.maximum_power_kw,
+            "chemistry": battery.chemistry,
+            "round_trip_efficiency": battery.round_trip_efficiency,
+            "end_of_life_cycles": battery.end_of_life_cycles,
             "battery_id": battery.battery_id
         }), 201
 
@@ -150,7 +160,13 @@ def update_battery():
         if battery_details is None:
             logger.error(f"error: Could not find the battery with ID: {validated.battery_id}, status code: 404")
             return jsonify({"error": f"Could not find the battery with ID: {validated.battery_id}"}), 404
-
+        model = None
+        if battery_details.chemistry is not None:
+            model = BatteryModel(
+                battery_details.chemistry,
+                battery_details.round_trip_efficiency,
+                battery_details.end_of_life_cycles,
+            )
 
         ob = OctaveBattery(
             battery_details.battery_id,
@@ -158,6 +174,7 @@ def update_battery():
             battery_details.maximum_power_kw,
             battery_details.state_of_charge,
             battery_details.cycles,
+            model,
         )
         if validated.power > 0:
             ob.charge(validated.power, duration_in_hours)
@@ -201,15 +218,15 @@ def get_soc():
                 logger.error(f"error: Could not find the battery with ID: {battery_id}, status code: 404")
                 return jsonify({"error": f"Could not find the battery with ID: {battery_id}"}), 404
 
-            return jsonify({
+            return encode({
                 "battery_id": battery_id,
                 "soc": battery.state_of_charge
-                }), 200
+                }, negotiate()), 200
         else:
             batteries = query.all()
-            return jsonify([
+            return encode([
                 {"battery_id": b.battery_id, "soc": b.state_of_charge} for b in batteries
-            ]), 200
+            ], negotiate()), 200
 
     except Exception as e:
         logger.error(f"Internal Server Error: {e}, status code: 500")
@@ -233,15 +250,15 @@ def get_cycles():
                 logger.error(f"error: Could not find the battery with ID: {battery_id}, status code: 404")
                 return jsonify({"error": f"Could not find the battery with ID: {battery_id}"}), 404
 
-            return jsonify({
+            return encode({
                 "battery_id": battery_id,
                 "cycles": round(battery.cycles, 2)
-                }), 200
+                }, negotiate()), 200
         else:
             batteries = query.all()
-            return jsonify([
+            return encode([
                 {"battery_id": b.battery_id, "cycles": round(b.cycles, 2)} for b in batteries
-                ])
+                ], negotiate()), 200
 
     except Exception as e:
         logger.error(f"Internal Server Error: {e}, status code: 500")
@@ -0,0 +1,124 @@
+from functools import lru_cache
+from math import ceil, sqrt
+
+# Breakpoints per chemistry. Capacity fade is (cycles, fraction of rated capacity)
+# and power derating is (soc %, fraction of maximum power). Charging tapers as the
+# battery fills up and discharging tapers as it runs empty.
+CHEMISTRIES = {
+    "lfp": {
+        "round_trip_efficiency": 0.95,
+        "capacity_fade": ((0, 1.0), (1000, 0.96), (3000, 0.9), (6000, 0.8)),
+        "charge_derating": ((0, 1.0), (90, 1.0), (95, 0.7), (100, 0.3)),
+        "discharge_derating": ((0, 0.3), (5, 0.7), (10, 1.0), (100, 1.0)),
+    },
+    "nmc": {
+        "round_trip_efficiency": 0.92,
+        "capacity_fade": ((0, 1.0), (500, 0.95), (1500, 0.87), (3000, 0.8)),
+        "charge_derating": ((0, 1.0), (80, 1.0), (90, 0.6), (100, 0.2)),
+        "discharge_derating": ((0, 0.2), (10, 0.6), (20, 1.0), (100, 1.0)),
+    },
+}
+
+
+def interpolate(points, x):
+    # Linear interpolation between breakpoints, clamped at both ends
+    if x <= points[0][0]:
+        return points[0][1]
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if x <= x1:
+            return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return points[-1][1]
+
+
+class LookupTables:
+    def __init__(self, chemistry):
+        params = CHEMISTRIES[chemistry]
+        fade = params["capacity_fade"]
+
+        # Sampled once per whole cycle and per whole soc %, so a step only needs
+        # an index (soc is always an int) or a single interpolation between two samples
+        self.max_cycles = fade[-1][0]
+        self.capacity_fade = tuple(
+            interpolate(fade, c) for c in range(self.max_cycles + 1)
+        )
+        self.charge_derating = tuple(
+            interpolate(params["charge_derating"], s) for s in range(101)
+        )
+        self.discharge_derating = tuple(
+            interpolate(params["discharge_derating"], s) for s in range(101)
+        )
+
+    def fade_at(self, cycles):
+        if cycles >= self.max_cycles:
+            return self.capacity_fade[-1]
+        if cycles <= 0:
+            return self.capacity_fade[0]
+        index = int(cycles)
+        low = self.capacity_fade[index]
+        return low + (self.capacity_fade[index + 1] - low) * (cycles - index)
+
+    def derating_at(self, state_of_charge, charging):
+        derating = self.charge_derating if charging else self.discharge_derating
+        return derating[min(max(int(state_of_charge), 0), 100)]
+
+
+@lru_cache(maxsize=None)
+def get_lookup_tables(chemistry):
+    # Tables only depend on the chemistry, so they are built once and shared by every battery
+    return LookupTables(chemistry)
+
+
+class BatteryModel:
+    def __init__(self, chemistry, round_trip_efficiency=None, end_of_life_cycles=None):
+        if chemistry not in CHEMISTRIES:
+            raise ValueError(f"Unknown battery chemistry: {chemistry}")
+
+        self.chemistry = chemistry
+        self.tables = get_lookup_tables(chemistry)
+        if round_trip_efficiency is None:
+            round_trip_efficiency = CHEMISTRIES[chemistry]["round_trip_efficiency"]
+        self.round_trip_efficiency = round_trip_efficiency
+
+        # Losses are split evenly between charging and discharging
+        self.one_way_efficiency = sqrt(round_trip_efficiency)
+
+        # The shared fade table is reused by scaling cycles onto its axis, so a
+        # battery can age faster or slower without building its own table
+        if end_of_life_cycles is None:
+            end_of_life_cycles = self.tables.max_cycles
+        self.end_of_life_cycles = end_of_life_cycles
+        self.cycle_scale = self.tables.max_cycles / end_of_life_cycles
+
+    def effective_capacity(self, capacity, cycles):
+        return capacity * self.tables.fade_at(cycles * self.cycle_scale)
+
+    def available_power(self, maximum_power, state_of_charge, charging):
+        return maximum_power * self.tables.derating_at(state_of_charge, charging)
+
+    def step_soc(self, state_of_charge, power, maximum_power, duration, capacity):
+        # Derating changes with soc, so instead of holding the starting power for the
+        # whole duration the step advances one whole soc % at a time, using the power
+        # of the table entry for that %. Charging from k to k + 1 reads entry k and
+        # discharging from k to k - 1 reads entry k. Returns the soc as a float.
+        charging = power > 0
+        soc = float(state_of_charge)
+        remaining = duration
+        while power != 0 and remaining > 0 and (soc < 100 if charging else soc > 0):
+            if charging:
+                index = int(soc)
+                boundary = index + 1
+                limit = self.available_power(maximum_power, index, charging)
+                energy_rate = min(power, limit) * self.one_way_efficiency
+            else:
+                index = ceil(soc)
+                boundary = index - 1
+                limit = self.available_power(maximum_power, index, charging)
+                energy_rate = max(power, -limit) / self.one_way_efficiency
+
+            soc_rate = energy_rate / capacity * 100  # soc % per hour
+            time_to_boundary = (boundary - soc) / soc_rate
+            if time_to_boundary >= remaining:
+                return soc + soc_rate * remaining
+            soc = boundary
+            remaining -= time_to_boundary
+        return soc
@@ -8,12 +8,16 @@ from utils.utils import logger
 
 
 class OctaveBattery:
-    def __init__(self, battery_id, capacity, maximum_power, state_of_charge, cycles):
+    def __init__(
+        self, battery_id, capacity, maximum_power, state_of_charge, cycles, model=None
+    ):
         self.battery_id = battery_id
         self.capacity_kwh = capacity  # kWh
         self.maximum_power_kw = maximum_power  # kW
         self.state_of_charge = min(max(state_of_charge, 0), 100)  # Soc can be in a valid range of 0-100
         self.cycles = cycles
+        # Optional BatteryModel, None keeps the ideal lossless battery
+        self.model = model
         self.client = self.get_paho_client()
 
     # Charges with default duration of 1 hour
@@ -25,7 +29,12 @@ class OctaveBattery:
         # Different sized batteries can have different SOC changes wrt same energy added. It is
         # important to take cap into account. Example: 2 KW energy change for a 10 kwh battery would
         # mean a 20% change in Soc and for a 100 kwh battery it would be 2%.
-        new_soc = int(self.state_of_charge + (energy_added / self.capacity_kwh) * 100)
+        if self.model is None:
+            new_soc = int(
+                self.state_of_charge + (energy_added / self.capacity_kwh) * 100
+            )
+        else:
+            new_soc = int(self.model_step(charging_power, duration))
 
         self.state_of_charge = min(max(new_soc, 0), 100) # Soc should be in valid range of 0 to 100
         return self
@@ -37,7 +46,12 @@ class OctaveBattery:
 
         before_discharge_soc = self.state_of_charge  # Before Discharge battery soc
 
-        new_soc = int(self.state_of_charge + (energy_consumed / self.capacity_kwh) * 100)
+        if self.model is None:
+            new_soc = int(
+                self.state_of_charge + (energy_consumed / self.capacity_kwh) * 100
+            )
+        else:
+            new_soc = int(self.model_step(discharging_power, duration))
         self.state_of_charge = min(max(new_soc, 0), 100)
 
         after_discharge_soc = self.state_of_charge  # After Discharge battery soc
@@ -45,6 +59,17 @@ class OctaveBattery:
         self.cycles += (before_discharge_soc - after_discharge_soc) / 100 #Updating Cycle count
         return self
 
+    def model_step(self, power, duration):
+        # Derating and losses depend on soc, so the model walks the step through its
+        # whole % tables
+        return self.model.step_soc(
+            self.state_of_charge,
+            power,
+            self.maximum_power_kw,
+            duration,
+            self.model.effective_capacity(self.capacity_kwh, self.cycles),
+        )
+
     def check_warning(self):
         warning = ""
         if self.state_of_charge > 90:
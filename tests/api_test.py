@@ -1,3 +1,6 @@
+import json
+
+import msgpack
 import pytest
 
 from database.db import Session, configure_database
@@ -211,3 +214,148 @@ def test_get_warning(test_client):
         f"/update?battery_id={battery_id}&power=-1&duration=570"
     )
     assert discharge_warning.status_code == 200
+
+
+def test_get_all_batteries_compact_json(test_client):
+    response = test_client.post("/", json={"capacity_kwh": 10, "maximum_power_kw": 1})
+    assert response.status_code == 201
+
+    default_resp = test_client.get("/get")
+    assert default_resp.mimetype == "application/json"
+    assert default_resp.get_json()["batteries"][0]["state_of_charge"] == "50%"
+
+    compact_resp = test_client.get(
+        "/get", headers={"Accept": "application/vnd.octave+json"}
+    )
+    assert compact_resp.status_code == 200
+    assert compact_resp.mimetype == "application/vnd.octave+json"
+    data = json.loads(compact_resp.data)
+    assert data["batteries"][0]["state_of_charge"] == 50
+
+
+def test_get_soc_msgpack(test_client):
+    response = test_client.post("/", json={"capacity_kwh": 10, "maximum_power_kw": 1})
+    assert response.status_code == 201
+    battery_id = response.get_json()["battery_id"]
+
+    get_resp = test_client.get(
+        f"/soc?battery_id={battery_id}", headers={"Accept": "application/msgpack"}
+    )
+    assert get_resp.status_code == 200
+    assert get_resp.mimetype == "application/msgpack"
+    data = msgpack.unpackb(get_resp.data)
+    assert data["battery_id"] == battery_id
+    assert data["soc"] == 50
+
+
+def test_get_all_batteries_msgpack(test_client):
+    response = test_client.post("/", json={"capacity_kwh": 10, "maximum_power_kw": 1})
+    assert response.status_code == 201
+
+    for mimetype in ["application/msgpack", "application/x-msgpack"]:
+        get_resp = test_client.get("/get", headers={"Accept": mimetype})
+        assert get_resp.status_code == 200
+        assert get_resp.mimetype == mimetype
+        assert "Accept" in get_resp.vary
+        data = msgpack.unpackb(get_resp.data)
+        assert data["total"] == 1
+        assert data["batteries"][0]["state_of_charge"] == 50
+
+
+def test_get_all_batteries_browser_accept(test_client):
+    response = test_client.post("/", json={"capacity_kwh": 10, "maximum_power_kw": 1})
+    assert response.status_code == 201
+
+    get_resp = test_client.get(
+        "/get",
+        headers={
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        },
+    )
+    assert get_resp.status_code == 200
+    assert get_resp.mimetype == "application/json"
+    assert "Accept" in get_resp.vary
+    assert get_resp.get_json()["batteries"][0]["state_of_charge"] == "50%"
+
+
+def test_get_soc_and_cycles_list_negotiated(test_client):
+    battery_ids = []
+    for _ in range(2):
+        response = test_client.post(
+            "/", json={"capacity_kwh": 10, "maximum_power_kw": 1}
+        )
+        assert response.status_code == 201
+        battery_ids.append(response.get_json()["battery_id"])
+
+    update_resp = test_client.patch(
+        f"/update?battery_id={battery_ids[0]}&power=-1&duration=60"
+    )
+    assert update_resp.status_code == 200
+
+    soc_resp = test_client.get("/soc", headers={"Accept": "application/x-msgpack"})
+    assert soc_resp.status_code == 200
+    assert soc_resp.mimetype == "application/x-msgpack"
+    soc = {b["battery_id"]: b["soc"] for b in msgpack.unpackb(soc_resp.data)}
+    assert soc == {battery_ids[0]: 40, battery_ids[1]: 50}
+
+    cycles_resp = test_client.get(
+        "/cycles", headers={"Accept": "application/vnd.octave+json"}
+    )
+    assert cycles_resp.status_code == 200
+    assert cycles_resp.mimetype == "application/vnd.octave+json"
+    assert "Accept" in cycles_resp.vary
+    cycles = {b["battery_id"]: b["cycles"] for b in json.loads(cycles_resp.data)}
+    assert cycles == {battery_ids[0]: 0.1, battery_ids[1]: 0}
+
+    single_resp = test_client.get(
+        f"/cycles?battery_id={battery_ids[0]}",
+        headers={"Accept": "application/msgpack"},
+    )
+    assert single_resp.status_code == 200
+    assert single_resp.mimetype == "application/msgpack"
+    assert msgpack.unpackb(single_resp.data) == {
+        "battery_id": battery_ids[0],
+        "cycles": 0.1,
+    }
+
+    default_resp = test_client.get("/cycles")
+    assert default_resp.mimetype == "application/json"
+    assert "Accept" in default_resp.vary
+
+
+def test_update_battery_with_chemistry(test_client):
+    response = test_client.post(
+        "/", json={"capacity_kwh": 10, "maximum_power_kw": 1, "chemistry": "lfp"}
+    )
+    assert response.status_code == 201
+    assert response.get_json()["chemistry"] == "lfp"
+    battery_id = response.get_json()["battery_id"]
+
+    update_resp = test_client.patch(
+        f"/update?battery_id={battery_id}&power=1&duration=60"
+    )
+    assert update_resp.status_code == 200
+    # charging losses at 95% round trip efficiency
+    assert update_resp.get_json()["state_of_charge"] == "59%"
+
+    get_resp = test_client.get(f"/{battery_id}")
+    assert get_resp.get_json()["chemistry"] == "lfp"
+    assert get_resp.get_json()["round_trip_efficiency"] is None
+    assert get_resp.get_json()["end_of_life_cycles"] is None
+
+    invalid_resp = test_client.post(
+        "/", json={"capacity_kwh": 10, "maximum_power_kw": 1, "chemistry": "lead"}
+    )
+    assert invalid_resp.status_code == 400
+
+    missing_chemistry = test_client.post(
+        "/",
+        json={"capacity_kwh": 10, "maximum_power_kw": 1, "round_trip_efficiency": 0.5},
+    )
+    assert missing_chemistry.status_code == 400
+
+    missing_chemistry = test_client.post(
+        "/",
+        json={"capacity_kwh": 10, "maximum_power_kw": 1, "end_of_life_cycles": 2000},
+    )
+    assert missing_chemistry.status_code == 400
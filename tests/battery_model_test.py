@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.battery_model import BatteryModel, get_lookup_tables
+from src.octave_batteries import OctaveBattery
+
+
+def test_lookup_tables_cached_per_chemistry():
+    assert BatteryModel("lfp").tables is BatteryModel("lfp", 0.9).tables
+    assert BatteryModel("lfp").tables is not BatteryModel("nmc").tables
+    assert get_lookup_tables("lfp") is get_lookup_tables("lfp")
+
+
+def test_capacity_fade():
+    model = BatteryModel("lfp")
+    assert model.effective_capacity(10, 0) == 10
+    assert model.effective_capacity(10, 500) == pytest.approx(9.8)
+    assert model.effective_capacity(10, 500.5) == pytest.approx(9.7998)
+    assert model.effective_capacity(10, 10000) == pytest.approx(8)
+
+    short_lived = BatteryModel("lfp", end_of_life_cycles=3000)
+    assert short_lived.tables is model.tables
+    assert short_lived.effective_capacity(10, 250) == pytest.approx(9.8)
+    assert short_lived.effective_capacity(10, 3000) == pytest.approx(8)
+
+
+def test_power_derating():
+    model = BatteryModel("nmc")
+    assert model.available_power(10, 50, charging=True) == 10
+    assert model.available_power(10, 50, charging=False) == 10
+    assert model.available_power(10, 85, charging=True) == pytest.approx(8)
+    assert model.available_power(10, 15, charging=False) == pytest.approx(8)
+    assert model.available_power(10, 100, charging=True) == pytest.approx(2)
+    assert model.available_power(10, 100, charging=False) == 10
+    assert model.available_power(10, 0, charging=True) == 10
+    assert model.available_power(10, 0, charging=False) == pytest.approx(2)
+
+
+def test_discharge_at_high_soc():
+    with patch.object(OctaveBattery, "get_paho_client", return_value=None):
+        ob = OctaveBattery("1", 10, 10, 100, 0, BatteryModel("nmc"))
+        ob.discharge(-10, 0.1)
+        # Full power is available near full, 1 kWh delivered draws 1 / sqrt(0.92) kWh
+        assert ob.state_of_charge == 89
+
+
+def test_charge_at_low_soc():
+    with patch.object(OctaveBattery, "get_paho_client", return_value=None):
+        ob = OctaveBattery("1", 10, 10, 0, 0, BatteryModel("nmc"))
+        ob.charge(10, 0.1)
+        # Full power is available near empty, 1 kWh charged stores sqrt(0.92) kWh
+        assert ob.state_of_charge == 9
+
+
+def test_charge_tapers_across_step():
+    with patch.object(OctaveBattery, "get_paho_client", return_value=None):
+        # Full power would reach 100% in this step, the taper above 80% holds it back
+        ob = OctaveBattery("1", 10, 10, 79, 0, BatteryModel("nmc"))
+        ob.charge(10, 0.3)
+        assert ob.state_of_charge == 97
+
+        ob = OctaveBattery("2", 10, 10, 79, 0, BatteryModel("nmc"))
+        ob.charge(10, 1)
+        assert ob.state_of_charge == 100
+
+
+def test_discharge_tapers_across_step():
+    with patch.object(OctaveBattery, "get_paho_client", return_value=None):
+        # Full power would empty the battery in this step, the taper below 20% holds it back
+        ob = OctaveBattery("1", 10, 10, 21, 0, BatteryModel("nmc"))
+        ob.discharge(-10, 0.3)
+        assert ob.state_of_charge == 2
+        assert ob.cycles == pytest.approx(0.19)
+
+
+def test_round_trip_efficiency():
+    assert BatteryModel("lfp").round_trip_efficiency == 0.95
+    model = BatteryModel("lfp", round_trip_efficiency=0.81)
+    assert model.one_way_efficiency == pytest.approx(0.9)
+
+    with pytest.raises(ValueError):
+        BatteryModel("lead")
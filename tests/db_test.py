@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from database.db import Session, configure_database
+from database.models import Battery
+
+
+def create_old_table(db_path, columns):
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE batteries ({columns}, PRIMARY KEY (battery_id))")
+    conn.commit()
+    conn.close()
+
+
+def column_names(db_path):
+    conn = sqlite3.connect(db_path)
+    names = [row[1] for row in conn.execute("PRAGMA table_info(batteries)")]
+    conn.close()
+    return names
+
+
+def test_configure_database_adds_missing_columns(tmp_path):
+    db_path = tmp_path / "octave.db"
+    create_old_table(
+        db_path,
+        "battery_id VARCHAR NOT NULL, capacity_kwh FLOAT NOT NULL, "
+        "maximum_power_kw FLOAT NOT NULL, state_of_charge INTEGER NOT NULL, "
+        "cycles FLOAT NOT NULL",
+    )
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO batteries VALUES ('1', 10, 1, 50, 0)")
+    conn.commit()
+    conn.close()
+
+    configure_database(f"sqlite:///{db_path}")
+    columns = column_names(db_path)
+
+    session = Session()
+    battery = session.query(Battery).filter_by(battery_id="1").one()
+    assert battery.chemistry is None
+    assert battery.round_trip_efficiency is None
+    assert battery.end_of_life_cycles is None
+    session.close()
+
+    # Running again finds nothing to add
+    configure_database(f"sqlite:///{db_path}")
+    assert column_names(db_path) == columns
+
+
+def test_configure_database_missing_not_null_column(tmp_path):
+    db_path = tmp_path / "octave.db"
+    create_old_table(
+        db_path,
+        "battery_id VARCHAR NOT NULL, capacity_kwh FLOAT NOT NULL, "
+        "maximum_power_kw FLOAT NOT NULL, state_of_charge INTEGER NOT NULL",
+    )
+
+    with pytest.raises(RuntimeError, match="cycles"):
+        configure_database(f"sqlite:///{db_path}")
@@ -0,0 +1,31 @@
+import msgpack
+import orjson
+from flask import Response, jsonify, request
+
+JSON_MIMETYPE = "application/json"
+COMPACT_JSON_MIMETYPE = "application/vnd.octave+json"
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def negotiate():
+    # application/json is offered first so that a missing or "*/*" Accept header
+    # keeps the default JSON output
+    offers = [JSON_MIMETYPE, COMPACT_JSON_MIMETYPE, *MSGPACK_MIMETYPES]
+    return request.accept_mimetypes.best_match(offers, default=JSON_MIMETYPE)
+
+
+def wants_numeric(mimetype):
+    # Clients that opt in to a compact encoding get numeric fields instead of display strings
+    return mimetype != JSON_MIMETYPE
+
+
+def encode(payload, mimetype):
+    if mimetype in MSGPACK_MIMETYPES:
+        response = Response(msgpack.packb(payload), mimetype=mimetype)
+    elif mimetype == COMPACT_JSON_MIMETYPE:
+        response = Response(orjson.dumps(payload), mimetype=mimetype)
+    else:
+        response = jsonify(payload)
+
+    response.vary.add("Accept")  # caches must key on the negotiated encoding
+    return response